@@ -1,6 +1,17 @@
-from typing import List
+from typing import List, Tuple
+from functools import lru_cache
+import gzip
 import json
-import xml.etree.ElementTree as ET
+
+try:
+    from lxml import etree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # ========================= ИСКЛЮЧЕНИЯ =========================
 class VehicleError(Exception):
@@ -18,6 +29,8 @@ class NotFoundError(VehicleError):
 # ========================= БАЗОВЫЕ КЛАССЫ =========================
 class Engine:
     """Класс двигателя"""
+    __slots__ = ("engine_type", "power")
+
     def __init__(self, engine_type: str, power: float):
         if power <= 0:
             raise InvalidValueError("Мощность двигателя должна быть больше 0")
@@ -27,12 +40,22 @@ class Engine:
     def to_dict(self) -> dict:
         return {"engine_type": self.engine_type, "power": self.power}
 
+    @classmethod
+    def _unchecked(cls, engine_type: str, power: float) -> "Engine":
+        """Создание без проверки — для уже проверенных данных из файла"""
+        o = object.__new__(cls)
+        o.engine_type = engine_type
+        o.power = power
+        return o
+
     @staticmethod
     def from_dict(data: dict) -> "Engine":
-        return Engine(data["engine_type"], data["power"])
+        return Engine._unchecked(data["engine_type"], data["power"])
 
 class Transmission:
     """Класс трансмиссии"""
+    __slots__ = ("transmission_type", "gears")
+
     def __init__(self, transmission_type: str, gears: int):
         if gears <= 0:
             raise InvalidValueError("Количество передач должно быть > 0")
@@ -42,115 +65,290 @@ class Transmission:
     def to_dict(self) -> dict:
         return {"transmission_type": self.transmission_type, "gears": self.gears}
 
+    @classmethod
+    def _unchecked(cls, transmission_type: str, gears: int) -> "Transmission":
+        """Создание без проверки — для уже проверенных данных из файла"""
+        o = object.__new__(cls)
+        o.transmission_type = transmission_type
+        o.gears = gears
+        return o
+
     @staticmethod
     def from_dict(data: dict) -> "Transmission":
-        return Transmission(data["transmission_type"], data["gears"])
+        return Transmission._unchecked(data["transmission_type"], data["gears"])
 
 class Wheel:
-    """Класс колеса"""
+    """Класс колеса (неизменяемый: экземпляры общие, см. Wheel.get)"""
+    __slots__ = ("size",)
+    _WHEEL_CACHE: dict = {}
+
     def __init__(self, size: int):
+        Wheel._check(size)
+        object.__setattr__(self, "size", size)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Колесо неизменяемо, создайте новое")
+
+    def __delattr__(self, name):
+        raise AttributeError("Колесо неизменяемо, создайте новое")
+
+    def __reduce__(self):
+        # copy, deepcopy и pickle восстанавливают общий экземпляр из кэша
+        return (Wheel._shared, (self.size,))
+
+    @staticmethod
+    def _check(size: int):
         if size < 10:
             raise InvalidValueError("Размер колеса слишком маленький")
-        self.size = size
 
     def to_dict(self) -> dict:
         return {"size": self.size}
 
+    @classmethod
+    def _unchecked(cls, size: int) -> "Wheel":
+        """Создание без проверки — для уже проверенных данных из файла"""
+        o = object.__new__(cls)
+        object.__setattr__(o, "size", size)
+        return o
+
+    @classmethod
+    def _shared(cls, size: int) -> "Wheel":
+        """Общий экземпляр без проверки — для уже проверенных данных"""
+        size = int(size)  # 19.0 из JSON и 19 — одно и то же колесо
+        w = cls._WHEEL_CACHE.get(size)
+        if w is None:
+            w = cls._WHEEL_CACHE[size] = cls._unchecked(size)
+        return w
+
+    @classmethod
+    def get(cls, size: int) -> "Wheel":
+        """Общий экземпляр колеса заданного размера (с проверкой размера)"""
+        cls._check(size)
+        return cls._shared(size)
+
     @staticmethod
     def from_dict(data: dict) -> "Wheel":
-        return Wheel(data["size"])
+        return Wheel._shared(data["size"])
 
 # ========================= ТРАНСПОРТ =========================
+def _xml_bool(text: str) -> bool:
+    """Разбирает логическое значение, записанное save_xml через str()"""
+    return text == "True"
+
+# Реестры классов по имени (поле "type" в JSON и тег в XML); заполняются
+# в Vehicle.__init_subclass__, поэтому новые подклассы попадают сюда сами
+_FROM_DICT: dict = {}
+_FROM_DICT_LEGACY: dict = {}
+_XML_CLASSES: dict = {}
+
+def _register(cls):
+    """Добавляет класс транспортного средства в реестры загрузки"""
+    name = cls.__name__
+    _FROM_DICT[name] = cls.from_dict
+    _FROM_DICT_LEGACY[name] = cls._from_dict_legacy
+    _XML_CLASSES[name] = cls
+
+def _compile(src: str, name: str, ns: dict):
+    """Компилирует сгенерированный исходный код и возвращает функцию name"""
+    exec(src, ns)
+    return ns[name]
+
 class Vehicle:
-    """Базовый класс транспортного средства"""
+    """Базовый класс транспортного средства.
+
+    Подклассы перечисляют собственные поля в _FIELDS как тройки
+    (имя, значение по умолчанию, преобразование текста XML). По полной схеме
+    класса при его создании генерируются to_dict, from_dict, _from_xml
+    и _unchecked без цепочек super().
+    """
+    __slots__ = ("model", "engine", "transmission", "wheel_sizes")
+    _FIELDS: tuple = ()
+    _ALL_FIELDS: tuple = ()
+
     def __init__(self, model: str, engine: Engine, transmission: Transmission, wheels: List[Wheel]):
         self.model = model
         self.engine = engine
         self.transmission = transmission
         self.wheels = wheels
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # _ALL_FIELDS здесь ещё унаследован от родителя
+        fields = cls._ALL_FIELDS + tuple(cls.__dict__.get("_FIELDS", ()))
+        cls._ALL_FIELDS = fields
+        names = [name for name, _, _ in fields]
+        ns = {"_cls": cls, "_new": object.__new__, "Engine": Engine, "Transmission": Transmission}
+        ns.update({"_d_" + name: default for name, default, _ in fields})
+        ns.update({"_c_" + name: convert for name, _, convert in fields})
+
+        if "to_dict" not in cls.__dict__:
+            items = "".join(f", {name!r}: self.{name}" for name in names)
+            cls.to_dict = _compile(
+                f"def to_dict(self):\n"
+                f"    return {{'type': {cls.__name__!r}, 'model': self.model,"
+                f" 'engine': self.engine.to_dict(), 'transmission': self.transmission.to_dict(),"
+                f" 'wheels': [{{'size': s}} for s in self.wheel_sizes]{items}}}\n",
+                "to_dict", ns)
+
+        if "_unchecked" not in cls.__dict__:
+            args = "".join(f", {name}" for name in names)
+            body = "".join(f"    o.{name} = {name}\n" for name in names)
+            cls._unchecked = classmethod(_compile(
+                f"def _unchecked(cls, model, engine, transmission, wheel_sizes{args}):\n"
+                f"    o = _new(cls)\n"
+                f"    o.model = model\n"
+                f"    o.engine = engine\n"
+                f"    o.transmission = transmission\n"
+                f"    o.wheel_sizes = wheel_sizes\n"
+                f"{body}"
+                f"    return o\n",
+                "_unchecked", ns))
+
+        # from_dict читает файлы текущей схемы, где все поля записаны всегда;
+        # _from_dict_legacy подставляет значения по умолчанию для старых файлов
+        for name, getter in (("from_dict", "data[{0!r}]"), ("_from_dict_legacy", "data.get({0!r}, _d_{0})")):
+            if name in cls.__dict__:
+                continue
+            body = "".join(f"    o.{field} = {getter.format(field)}\n" for field in names)
+            setattr(cls, name, staticmethod(_compile(
+                f"def {name}(data):\n"
+                f"    o = _new(_cls)\n"
+                f"    o.model = data['model']\n"
+                f"    o.engine = Engine.from_dict(data['engine'])\n"
+                f"    o.transmission = Transmission.from_dict(data['transmission'])\n"
+                f"    o.wheel_sizes = tuple([w['size'] for w in data['wheels']])\n"
+                f"{body}"
+                f"    return o\n",
+                name, ns)))
+
+        if "_from_xml" not in cls.__dict__:
+            args = "".join(
+                f", _c_{name}(fields[{name!r}]) if {name!r} in fields else _d_{name}" for name in names)
+            cls._from_xml = staticmethod(_compile(
+                f"def _from_xml(model, engine, transmission, wheel_sizes, fields):\n"
+                f"    return _cls._unchecked(model, engine, transmission, wheel_sizes{args})\n",
+                "_from_xml", ns))
+
+        _register(cls)
+
     def to_dict(self) -> dict:
         return {
             "type": "Vehicle",
             "model": self.model,
             "engine": self.engine.to_dict(),
             "transmission": self.transmission.to_dict(),
-            "wheels": [w.to_dict() for w in self.wheels]
+            "wheels": [{"size": s} for s in self.wheel_sizes]
         }
 
+    @property
+    def wheels(self) -> Tuple[Wheel, ...]:
+        """Колёса в виде объектов Wheel (хранятся только размеры).
+
+        Возвращается кортеж: заменить колёса можно только присваиванием.
+        """
+        return tuple([Wheel._shared(s) for s in self.wheel_sizes])
+
+    @wheels.setter
+    def wheels(self, wheels: List[Wheel]):
+        for w in wheels:
+            if not isinstance(w, Wheel):
+                raise InvalidValueError("Колёса должны быть объектами Wheel")
+        self.wheel_sizes = tuple([w.size for w in wheels])
+
+    @classmethod
+    def _unchecked(cls, model: str, engine: Engine, transmission: Transmission, wheel_sizes: tuple) -> "Vehicle":
+        """Создание в обход __init__ — для уже проверенных данных из файла"""
+        o = object.__new__(cls)
+        o.model = model
+        o.engine = engine
+        o.transmission = transmission
+        o.wheel_sizes = wheel_sizes
+        return o
+
     @staticmethod
     def from_dict(data: dict) -> "Vehicle":
         engine = Engine.from_dict(data["engine"])
         transmission = Transmission.from_dict(data["transmission"])
-        wheels = [Wheel.from_dict(w) for w in data["wheels"]]
-        return Vehicle(data["model"], engine, transmission, wheels)
+        wheel_sizes = tuple([w["size"] for w in data["wheels"]])
+        return Vehicle._unchecked(data["model"], engine, transmission, wheel_sizes)
+
+    _from_dict_legacy = from_dict
+
+    @staticmethod
+    def _from_xml(model: str, engine: Engine, transmission: Transmission, wheel_sizes: tuple, fields: dict) -> "Vehicle":
+        """Создание из разобранного XML: fields — тексты дочерних элементов по тегам"""
+        return Vehicle._unchecked(model, engine, transmission, wheel_sizes)
+
+_register(Vehicle)
 
 class Car(Vehicle):
     """Класс легкового автомобиля"""
+    __slots__ = ("seats",)
+    _FIELDS = (("seats", 4, int),)
+
     def __init__(self, model: str, engine: Engine, transmission: Transmission, wheels: List[Wheel], seats: int):
         super().__init__(model, engine, transmission, wheels)
         self.seats = seats
 
-    def to_dict(self) -> dict:
-        data = super().to_dict()
-        data.update({"type": "Car", "seats": self.seats})
-        return data
-
-    @staticmethod
-    def from_dict(data: dict) -> "Car":
-        vehicle = Vehicle.from_dict(data)
-        return Car(vehicle.model, vehicle.engine, vehicle.transmission, vehicle.wheels, data.get("seats", 4))
-
 class ElectricCar(Car):
     """Электромобиль"""
+    __slots__ = ("battery_capacity",)
+    _FIELDS = (("battery_capacity", 0, float),)
+
     def __init__(self, model: str, engine: Engine, transmission: Transmission, wheels: List[Wheel], seats: int, battery_capacity: float):
         super().__init__(model, engine, transmission, wheels, seats)
         self.battery_capacity = battery_capacity
 
-    def to_dict(self) -> dict:
-        data = super().to_dict()
-        data.update({"type": "ElectricCar", "battery_capacity": self.battery_capacity})
-        return data
-
-    @staticmethod
-    def from_dict(data: dict) -> "ElectricCar":
-        car = Car.from_dict(data)
-        return ElectricCar(car.model, car.engine, car.transmission, car.wheels, car.seats, data.get("battery_capacity", 0))
-
 class Bus(Vehicle):
     """Автобус"""
+    __slots__ = ("capacity", "double_decker")
+    _FIELDS = (("capacity", 20, int), ("double_decker", False, _xml_bool))
+
     def __init__(self, model: str, engine: Engine, transmission: Transmission, wheels: List[Wheel], capacity: int, double_decker: bool):
         super().__init__(model, engine, transmission, wheels)
         self.capacity = capacity
         self.double_decker = double_decker
 
-    def to_dict(self) -> dict:
-        data = super().to_dict()
-        data.update({"type": "Bus", "capacity": self.capacity, "double_decker": self.double_decker})
-        return data
-
-    @staticmethod
-    def from_dict(data: dict) -> "Bus":
-        vehicle = Vehicle.from_dict(data)
-        return Bus(vehicle.model, vehicle.engine, vehicle.transmission, vehicle.wheels, data.get("capacity", 20), data.get("double_decker", False))
-
 class Motorcycle(Vehicle):
     """Мотоцикл"""
+    __slots__ = ("moto_type",)
+    _FIELDS = (("moto_type", "Unknown", str),)
+
     def __init__(self, model: str, engine: Engine, transmission: Transmission, wheels: List[Wheel], moto_type: str):
         super().__init__(model, engine, transmission, wheels)
         self.moto_type = moto_type
 
-    def to_dict(self) -> dict:
-        data = super().to_dict()
-        data.update({"type": "Motorcycle", "moto_type": self.moto_type})
-        return data
-
-    @staticmethod
-    def from_dict(data: dict) -> "Motorcycle":
-        vehicle = Vehicle.from_dict(data)
-        return Motorcycle(vehicle.model, vehicle.engine, vehicle.transmission, vehicle.wheels, data.get("moto_type", "Unknown"))
-
 # ========================= ХРАНИЛИЩЕ =========================
+# Версия формата JSON; в файлах этой версии записаны все поля объектов
+_SCHEMA_VERSION = 2
+
+@lru_cache(maxsize=256)
+def _parse_wheel_sizes(text: str) -> tuple:
+    """Разбирает строку размеров колёс ("19 19 19 19") в кортеж чисел.
+
+    Наборы колёс в каталоге почти всегда повторяются, поэтому результат
+    кэшируется и int() вызывается один раз на каждый уникальный набор.
+    """
+    return tuple(map(int, text.split()))
+
+def _dump_json(data, pretty: bool) -> bytes:
+    """Сериализует данные в JSON (UTF-8), через orjson если он установлен"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+    return json.dumps(data, indent=2 if pretty else None, ensure_ascii=False).encode("utf-8")
+
+def _load_json(buf: bytes):
+    """Разбирает JSON из байтов, через orjson если он установлен"""
+    if orjson is not None:
+        return orjson.loads(buf)
+    return json.loads(buf)
+
+def _child_texts(elem) -> dict:
+    """Тексты дочерних элементов по тегам (как findtext: "" для пустых)"""
+    if elem is None:
+        return {}
+    return {c.tag: c.text or "" for c in elem}
+
 class VehicleStorage:
     """Хранилище транспортных средств"""
     def __init__(self):
@@ -163,96 +361,126 @@ class VehicleStorage:
         return self.vehicles
 
     def save_json(self, filename: str):
-        data = [v.to_dict() for v in self.vehicles]
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4)
+        buf = _dump_json(self._to_data(), pretty=True)
+        with open(filename, "wb") as f:
+            f.write(buf)
 
     def load_json(self, filename: str):
         try:
-            with open(filename, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            with open(filename, "rb") as f:
+                data = _load_json(f.read())
         except FileNotFoundError:
             print("Файл JSON не найден, создаём новое хранилище")
             self.vehicles = []
             return
+        self._from_data(data)
 
+    def save(self, filename: str):
+        """Сохраняет хранилище в сжатый архив JSON (например, vehicles.json.gz)"""
+        buf = _dump_json(self._to_data(), pretty=False)
+        # При compresslevel=1 сжатие быстрее записи на диск
+        with gzip.open(filename, "wb", compresslevel=1) as f:
+            f.write(buf)
+
+    def load(self, filename: str):
+        """Загружает хранилище из архива, созданного save()"""
+        try:
+            with gzip.open(filename, "rb") as f:
+                data = _load_json(f.read())
+        except FileNotFoundError:
+            print("Архив не найден, создаём новое хранилище")
+            self.vehicles = []
+            return
+        self._from_data(data)
+
+    def _to_data(self) -> dict:
+        return {"schema_version": _SCHEMA_VERSION, "vehicles": [v.to_dict() for v in self.vehicles]}
+
+    def _from_data(self, data):
         self.vehicles = []
-        for item in data:
-            t = item.get("type", "Vehicle")
-            if t == "Car":
-                self.vehicles.append(Car.from_dict(item))
-            elif t == "ElectricCar":
-                self.vehicles.append(ElectricCar.from_dict(item))
-            elif t == "Bus":
-                self.vehicles.append(Bus.from_dict(item))
-            elif t == "Motorcycle":
-                self.vehicles.append(Motorcycle.from_dict(item))
-            else:
-                self.vehicles.append(Vehicle.from_dict(item))
+        append = self.vehicles.append
+        if isinstance(data, list):
+            # Старый формат: список объектов, часть полей может отсутствовать
+            for item in data:
+                append(_FROM_DICT_LEGACY.get(item.get("type", "Vehicle"), Vehicle.from_dict)(item))
+        elif isinstance(data, dict) and data.get("schema_version") == _SCHEMA_VERSION:
+            for item in data["vehicles"]:
+                append(_FROM_DICT.get(item["type"], Vehicle.from_dict)(item))
+        elif isinstance(data, dict):
+            raise VehicleError(f"Неподдерживаемая версия формата: {data.get('schema_version')!r}")
+        else:
+            raise VehicleError("Неизвестный формат файла хранилища")
 
     def save_xml(self, filename: str):
+        SubElement = ET.SubElement
         root = ET.Element("Vehicles")
         for v in self.vehicles:
-            veh_type = v.to_dict().get("type", "Vehicle")
-            veh_elem = ET.SubElement(root, veh_type)
-            ET.SubElement(veh_elem, "model").text = v.model
+            veh_elem = SubElement(root, type(v).__name__)
+            SubElement(veh_elem, "model").text = v.model
             # Engine
-            eng_elem = ET.SubElement(veh_elem, "engine")
-            ET.SubElement(eng_elem, "type").text = v.engine.engine_type
-            ET.SubElement(eng_elem, "power").text = str(v.engine.power)
+            v_engine = v.engine
+            eng_elem = SubElement(veh_elem, "engine")
+            SubElement(eng_elem, "type").text = v_engine.engine_type
+            SubElement(eng_elem, "power").text = str(v_engine.power)
             # Transmission
-            trans_elem = ET.SubElement(veh_elem, "transmission")
-            ET.SubElement(trans_elem, "type").text = v.transmission.transmission_type
-            ET.SubElement(trans_elem, "gears").text = str(v.transmission.gears)
+            v_trans = v.transmission
+            trans_elem = SubElement(veh_elem, "transmission")
+            SubElement(trans_elem, "type").text = v_trans.transmission_type
+            SubElement(trans_elem, "gears").text = str(v_trans.gears)
             # Wheels
-            wheels_elem = ET.SubElement(veh_elem, "wheels")
-            for w in v.wheels:
-                ET.SubElement(wheels_elem, "wheel").text = str(w.size)
+            SubElement(veh_elem, "wheels").text = " ".join(map(str, v.wheel_sizes))
             # Дополнительные поля
-            d = v.to_dict()
-            for key in d:
-                if key not in ["type", "model", "engine", "transmission", "wheels"]:
-                    ET.SubElement(veh_elem, key).text = str(d[key])
-        tree = ET.ElementTree(root)
-        tree.write(filename, encoding="utf-8", xml_declaration=True)
+            for name, _, _ in type(v)._ALL_FIELDS:
+                SubElement(veh_elem, name).text = str(getattr(v, name))
+        # Сериализуем целиком в память и записываем одним вызовом
+        buf = ET.tostring(root, encoding="utf-8", xml_declaration=True)
+        with open(filename, "wb") as f:
+            f.write(buf)
 
     def load_xml(self, filename: str):
         try:
-            tree = ET.parse(filename)
-            root = tree.getroot()
+            events = ET.iterparse(filename, events=("start", "end"))
+            _, root = next(events)
         except FileNotFoundError:
             print("Файл XML не найден, создаём новое хранилище")
             self.vehicles = []
             return
 
         self.vehicles = []
-        for veh in root:
-            vehicle_type = veh.tag
-            model = veh.findtext("model", default="Unknown")
-            engine_type = veh.findtext("engine/type", default="Unknown")
-            power = float(veh.findtext("engine/power", default="0"))
-            engine = Engine(engine_type, power)
-            trans_type = veh.findtext("transmission/type", default="Manual")
-            gears = int(veh.findtext("transmission/gears", default="1"))
-            transmission = Transmission(trans_type, gears)
-            wheels = [Wheel(int(w.text)) for w in veh.find("wheels")]
-
-            if vehicle_type == "Car":
-                seats = int(veh.findtext("seats", default="4"))
-                self.vehicles.append(Car(model, engine, transmission, wheels, seats))
-            elif vehicle_type == "ElectricCar":
-                seats = int(veh.findtext("seats", default="4"))
-                battery = float(veh.findtext("battery_capacity", default="0"))
-                self.vehicles.append(ElectricCar(model, engine, transmission, wheels, seats, battery))
-            elif vehicle_type == "Bus":
-                capacity = int(veh.findtext("capacity", default="20"))
-                double = veh.findtext("double_decker", default="False") == "True"
-                self.vehicles.append(Bus(model, engine, transmission, wheels, capacity, double))
-            elif vehicle_type == "Motorcycle":
-                moto_type = veh.findtext("moto_type", default="Unknown")
-                self.vehicles.append(Motorcycle(model, engine, transmission, wheels, moto_type))
+        append = self.vehicles.append
+        # Транспортные средства — элементы глубины 1 (прямые потомки корня)
+        depth = 0
+        for event, veh in events:
+            if event == "start":
+                depth += 1
+                continue
+            depth -= 1
+            if depth:
+                continue
+            cls = _XML_CLASSES.get(veh.tag, Vehicle)
+            # Один проход по дочерним элементам вместо повторных findtext
+            children = {c.tag: c for c in veh}
+            fields = {tag: c.text or "" for tag, c in children.items()}
+            model = fields.get("model", "Unknown")
+            eng = _child_texts(children.get("engine"))
+            engine = Engine._unchecked(eng.get("type", "Unknown"), float(eng.get("power", "0")))
+            trans = _child_texts(children.get("transmission"))
+            transmission = Transmission._unchecked(trans.get("type", "Manual"), int(trans.get("gears", "1")))
+            wheels_elem = children["wheels"]
+            if len(wheels_elem):
+                # Старый формат: отдельный элемент <wheel> на каждое колесо
+                wheels = tuple([int(w.text) for w in wheels_elem])
+            else:
+                wheels = _parse_wheel_sizes(wheels_elem.text or "")
+            append(cls._from_xml(model, engine, transmission, wheels, fields))
+            # Разобранный элемент больше не нужен — отцепляем его от корня,
+            # чтобы дерево в памяти не росло вместе с файлом
+            if hasattr(veh, "getprevious"):  # lxml
+                veh.clear()
+                while veh.getprevious() is not None:
+                    del veh.getparent()[0]
             else:
-                self.vehicles.append(Vehicle(model, engine, transmission, wheels))
+                root.clear()
 
 
 # ========================= ПРИМЕР ИСПОЛЬЗОВАНИЯ =========================